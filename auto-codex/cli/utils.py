@@ -15,8 +15,7 @@ if str(_PARENT_DIR) not in sys.path:
     sys.path.insert(0, str(_PARENT_DIR))
 
 from core.auth import (
-    get_auth_token,
-    get_auth_token_source,
+    get_auth_token_with_source,
     get_deprecated_auth_token,
     is_valid_codex_config_dir,
     is_valid_codex_oauth_token,
@@ -110,8 +109,7 @@ def validate_environment(spec_dir: Path) -> bool:
     openai_key = os.environ.get("OPENAI_API_KEY", "")
     oauth_token = os.environ.get("CODEX_CODE_OAUTH_TOKEN", "")
     codex_config_dir = os.environ.get("CODEX_CONFIG_DIR", "")
-    auth_token = get_auth_token()
-    source = get_auth_token_source()
+    auth_token, source = get_auth_token_with_source()
 
     if openai_key and not is_valid_openai_api_key(openai_key):
         if not auth_token or source == "OPENAI_API_KEY":
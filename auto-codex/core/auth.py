@@ -7,6 +7,7 @@ for legacy LLM OAuth tokens, plus SDK environment variable passthrough.
 
 import os
 import re
+from collections.abc import Mapping
 
 # Priority order for auth token resolution.
 #
@@ -35,8 +36,10 @@ SDK_ENV_VARS = [
     "API_TIMEOUT_MS",
 ]
 
-_OPENAI_KEY_PATTERN = re.compile(r"^sk-[A-Za-z0-9-]{20,}$")
+# 20+ characters, none of them whitespace (\s matches exactly str.isspace())
+_OPAQUE_TOKEN_PATTERN = re.compile(r"\S{20,}")
 _DEFAULT_CODEX_CONFIG_DIR = os.path.expanduser("~/.codex")
+_DISABLE_DEFAULT_CONFIG_DIR_ENV = "AUTO_CODEX_DISABLE_DEFAULT_CODEX_CONFIG_DIR"
 
 
 def _looks_like_api_key(token: str) -> bool:
@@ -47,8 +50,7 @@ def _looks_like_api_key(token: str) -> bool:
     (e.g. gateway/proxy keys). We treat these as valid if they are non-empty, contain
     no whitespace, and have a reasonable minimum length.
     """
-    t = (token or "").strip()
-    return bool(t) and (len(t) >= 20) and not any(c.isspace() for c in t)
+    return _OPAQUE_TOKEN_PATTERN.fullmatch((token or "").strip()) is not None
 
 
 def is_valid_openai_api_key(token: str) -> bool:
@@ -59,7 +61,10 @@ def is_valid_openai_api_key(token: str) -> bool:
     third-party Codex gateways.
     """
     t = (token or "").strip()
-    return bool(_OPENAI_KEY_PATTERN.match(t)) or _looks_like_api_key(t)
+    # Canonical `sk-` keys are a subset of what _looks_like_api_key accepts, so
+    # matching them separately never changes the result. The length test
+    # rejects short strings before any per-character scan.
+    return len(t) >= 20 and _looks_like_api_key(t)
 
 
 def is_valid_codex_oauth_token(token: str) -> bool:
@@ -69,8 +74,7 @@ def is_valid_codex_oauth_token(token: str) -> bool:
     Codex OAuth tokens do not share the OPENAI_API_KEY "sk-..." pattern, so we
     apply a conservative sanity check (non-empty, no whitespace, reasonable length).
     """
-    t = (token or "").strip()
-    return bool(t) and (len(t) >= 20) and not any(c.isspace() for c in t)
+    return _OPAQUE_TOKEN_PATTERN.fullmatch((token or "").strip()) is not None
 
 
 def is_valid_codex_config_dir(config_dir: str) -> bool:
@@ -79,14 +83,19 @@ def is_valid_codex_config_dir(config_dir: str) -> bool:
     return bool(p) and os.path.isdir(p)
 
 
-def has_default_codex_config_dir() -> bool:
+def has_default_codex_config_dir(env: Mapping[str, str] | None = None) -> bool:
     """
     Return True if the default Codex CLI config dir (~/.codex) looks usable.
 
     This supports setups where Codex CLI auth is configured via its default
     on-disk config (e.g. third-party provider profiles) without exporting env vars.
+
+    Args:
+        env: Environment snapshot to read the opt-out flag from (defaults to os.environ)
     """
-    if os.environ.get("AUTO_CODEX_DISABLE_DEFAULT_CODEX_CONFIG_DIR", "").strip():
+    if env is None:
+        env = os.environ
+    if env.get(_DISABLE_DEFAULT_CONFIG_DIR_ENV, "").strip():
         return False
     if not os.path.isdir(_DEFAULT_CODEX_CONFIG_DIR):
         return False
@@ -104,54 +113,60 @@ def get_deprecated_auth_token() -> str | None:
     return None
 
 
-def get_auth_token() -> str | None:
+def _resolve_auth(env: Mapping[str, str] | None = None) -> tuple[str | None, str | None]:
     """
-    Get authentication token from environment variables.
+    Resolve the auth token and the name of its source in a single pass.
 
-    Checks sources in priority order:
-    1. OPENAI_API_KEY (env var, validated)
-    2. CODEX_CODE_OAUTH_TOKEN (env var)
-    3. CODEX_CONFIG_DIR (env var, directory existence)
+    Args:
+        env: Environment snapshot to read from (defaults to os.environ)
 
     Returns:
-        Token string if found, None otherwise
+        Tuple of (token, source); both None if no source is configured
     """
-    openai_token = os.environ.get("OPENAI_API_KEY", "")
+    if env is None:
+        env = os.environ
+
+    openai_token = env.get("OPENAI_API_KEY", "")
     if openai_token and is_valid_openai_api_key(openai_token):
-        return openai_token.strip()
+        return openai_token.strip(), "OPENAI_API_KEY"
 
-    oauth_token = os.environ.get("CODEX_CODE_OAUTH_TOKEN", "")
+    oauth_token = env.get("CODEX_CODE_OAUTH_TOKEN", "")
     if oauth_token and is_valid_codex_oauth_token(oauth_token):
-        return oauth_token.strip()
+        return oauth_token.strip(), "CODEX_CODE_OAUTH_TOKEN"
 
-    config_dir = os.environ.get("CODEX_CONFIG_DIR", "")
+    config_dir = env.get("CODEX_CONFIG_DIR", "")
     if config_dir and is_valid_codex_config_dir(config_dir):
-        return config_dir.strip()
+        return config_dir.strip(), "CODEX_CONFIG_DIR"
 
-    if has_default_codex_config_dir():
-        return _DEFAULT_CODEX_CONFIG_DIR
+    if has_default_codex_config_dir(env):
+        return _DEFAULT_CODEX_CONFIG_DIR, "DEFAULT_CODEX_CONFIG_DIR"
 
-    return None
+    return None, None
 
 
-def get_auth_token_source() -> str | None:
-    """Get the name of the source that provided the auth token."""
-    openai_token = os.environ.get("OPENAI_API_KEY", "")
-    if openai_token and is_valid_openai_api_key(openai_token):
-        return "OPENAI_API_KEY"
+def get_auth_token() -> str | None:
+    """
+    Get authentication token from environment variables.
 
-    oauth_token = os.environ.get("CODEX_CODE_OAUTH_TOKEN", "")
-    if oauth_token and is_valid_codex_oauth_token(oauth_token):
-        return "CODEX_CODE_OAUTH_TOKEN"
+    Checks sources in priority order:
+    1. OPENAI_API_KEY (env var, validated)
+    2. CODEX_CODE_OAUTH_TOKEN (env var)
+    3. CODEX_CONFIG_DIR (env var, directory existence)
 
-    config_dir = os.environ.get("CODEX_CONFIG_DIR", "")
-    if config_dir and is_valid_codex_config_dir(config_dir):
-        return "CODEX_CONFIG_DIR"
+    Returns:
+        Token string if found, None otherwise
+    """
+    return _resolve_auth()[0]
 
-    if has_default_codex_config_dir():
-        return "DEFAULT_CODEX_CONFIG_DIR"
 
-    return None
+def get_auth_token_source() -> str | None:
+    """Get the name of the source that provided the auth token."""
+    return _resolve_auth()[1]
+
+
+def get_auth_token_with_source() -> tuple[str | None, str | None]:
+    """Get the auth token and its source name without resolving twice."""
+    return _resolve_auth()
 
 
 def require_auth_token() -> str:
@@ -161,34 +176,39 @@ def require_auth_token() -> str:
     Raises:
         ValueError: If no auth token is found in any supported source
     """
-    token = get_auth_token()
+    # Read each auth variable once; the same snapshot drives resolution and
+    # the error reporting below.
+    env = {
+        var: os.environ.get(var, "")
+        for var in (*AUTH_TOKEN_ENV_VARS, _DISABLE_DEFAULT_CONFIG_DIR_ENV)
+    }
+
+    token, _source = _resolve_auth(env)
     if token:
         return token
 
-    openai_token = os.environ.get("OPENAI_API_KEY", "")
-    if openai_token and not is_valid_openai_api_key(openai_token):
+    # Resolution validated every source in this snapshot and none passed, so
+    # any variable that is set here is invalid; no need to re-check (or stat
+    # CODEX_CONFIG_DIR) again just to explain what's wrong.
+    if env["OPENAI_API_KEY"]:
         raise ValueError(
             "Invalid OPENAI_API_KEY format.\n"
             "Expected a non-empty key without whitespace (OpenAI keys often start with 'sk-')."
         )
 
-    oauth_token = os.environ.get("CODEX_CODE_OAUTH_TOKEN", "")
-    if oauth_token and not is_valid_codex_oauth_token(oauth_token):
+    if env["CODEX_CODE_OAUTH_TOKEN"]:
         raise ValueError(
             "Invalid CODEX_CODE_OAUTH_TOKEN format.\n"
             "Expected a non-empty token without whitespace."
         )
 
-    config_dir = os.environ.get("CODEX_CONFIG_DIR", "")
-    if config_dir and not is_valid_codex_config_dir(config_dir):
+    config_dir = env["CODEX_CONFIG_DIR"]
+    if config_dir:
         raise ValueError(
             "Invalid CODEX_CONFIG_DIR.\n"
             f"Directory does not exist: {config_dir}"
         )
 
-    if has_default_codex_config_dir():
-        return _DEFAULT_CODEX_CONFIG_DIR
-
     deprecated_token = get_deprecated_auth_token()
     if deprecated_token:
         raise ValueError(
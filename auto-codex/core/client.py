@@ -8,40 +8,54 @@ legacy streaming API used across agents.
 
 from __future__ import annotations
 
+import functools
 import os
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, AsyncIterator, Optional
 
 from core.auth import require_auth_token
-from core.protocols import EventType, LLMClientProtocol, LLMEvent
+from core.protocols import EventType, LLMClientProtocol, LLMEvent, iter_event_batches
 from providers import CodexCliClient
+from providers.codex_cli import configured_model, worker_pool_enabled
 from security import CodexSecurityConfig, get_security_profile
 
+# Provider clients are stateless apart from their session table, so callers
+# asking for the same configuration share one instance. Keyed on the resolved
+# configuration (env defaults included) and bounded LRU-style.
+_CLIENT_CACHE: OrderedDict[tuple[Any, ...], CodexCliClient] = OrderedDict()
+_CLIENT_CACHE_LOCK = threading.Lock()
+_CLIENT_CACHE_SIZE = 32
 
-@dataclass
+# Paths Codex may touch under the project root.
+_SECURITY_ALLOWED_PATHS = ("./**",)
+
+
+@dataclass(slots=True)
 class TextBlock:
     text: str
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolUseBlock:
     name: str
     input: Any | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class ToolResultBlock:
     content: Any | None = None
     is_error: bool = False
 
 
-@dataclass
+@dataclass(slots=True)
 class AssistantMessage:
     content: list[Any]
 
 
-@dataclass
+@dataclass(slots=True)
 class UserMessage:
     content: list[Any]
 
@@ -78,50 +92,65 @@ class CodexClientAdapter:
         if not self._session_id:
             raise RuntimeError("No active session; call query() first.")
 
-        async for event in self._client.stream_events(self._session_id):
-            message = _event_to_message(event)
-            if message:
-                yield message
+        async for batch in iter_event_batches(self._client, self._session_id):
+            for event in batch:
+                message = _event_to_message(event)
+                if message:
+                    yield message
 
-        await self._client.close(self._session_id)
-        self._session_id = None
+        # Providers may already close the session when the stream ends (the
+        # Codex CLI client does); close() is a cheap no-op in that case.
+        session_id, self._session_id = self._session_id, None
+        await self._client.close(session_id)
 
 
-def _event_to_message(event: LLMEvent) -> Any | None:
-    if event.type == EventType.TEXT:
-        text = _extract_text(event)
-        if text:
-            return AssistantMessage(content=[TextBlock(text=text)])
-        return None
-    if event.type == EventType.TOOL_START:
-        name = event.data.get("name") or event.data.get("tool") or "tool"
-        return AssistantMessage(
-            content=[ToolUseBlock(name=name, input=event.data.get("input"))]
-        )
-    if event.type == EventType.TOOL_RESULT:
-        return UserMessage(
-            content=[
-                ToolResultBlock(
-                    content=event.data.get("content"),
-                    is_error=bool(event.data.get("is_error")),
-                )
-            ]
-        )
-    if event.type == EventType.ERROR:
-        error_text = event.data.get("error") or "Unknown error"
-        stderr = event.data.get("stderr")
-        if stderr:
-            error_text = f"{error_text}\n{stderr}"
-        return AssistantMessage(content=[TextBlock(text=str(error_text))])
+def _text_message(event: LLMEvent) -> Any | None:
+    data = event.data
+    text = data.get("text") or data.get("content") or data.get("raw")
+    if text:
+        return AssistantMessage(content=[TextBlock(text=str(text))])
     return None
 
 
-def _extract_text(event: LLMEvent) -> str:
-    for key in ("text", "content", "raw"):
-        value = event.data.get(key)
-        if value:
-            return str(value)
-    return ""
+def _tool_start_message(event: LLMEvent) -> Any | None:
+    name = event.data.get("name") or event.data.get("tool") or "tool"
+    return AssistantMessage(
+        content=[ToolUseBlock(name=name, input=event.data.get("input"))]
+    )
+
+
+def _tool_result_message(event: LLMEvent) -> Any | None:
+    return UserMessage(
+        content=[
+            ToolResultBlock(
+                content=event.data.get("content"),
+                is_error=bool(event.data.get("is_error")),
+            )
+        ]
+    )
+
+
+def _error_message(event: LLMEvent) -> Any | None:
+    error_text = event.data.get("error") or "Unknown error"
+    stderr = event.data.get("stderr")
+    if stderr:
+        error_text = f"{error_text}\n{stderr}"
+    return AssistantMessage(content=[TextBlock(text=str(error_text))])
+
+
+# Event type -> legacy message builder. Session lifecycle events have no
+# message equivalent and are dropped.
+_MESSAGE_BUILDERS = {
+    EventType.TEXT: _text_message,
+    EventType.TOOL_START: _tool_start_message,
+    EventType.TOOL_RESULT: _tool_result_message,
+    EventType.ERROR: _error_message,
+}
+
+
+def _event_to_message(event: LLMEvent) -> Any | None:
+    builder = _MESSAGE_BUILDERS.get(event.type)
+    return builder(event) if builder else None
 
 
 def create_client(
@@ -143,17 +172,12 @@ def create_client(
     """
     require_auth_token()
 
-    resolved_project_dir = Path(project_dir or Path.cwd()).resolve()
+    resolved_project_dir = _resolved(project_dir or os.getcwd())
     resolved_spec_dir = (
-        Path(spec_dir).resolve() if spec_dir is not None else resolved_project_dir
+        _resolved(spec_dir) if spec_dir is not None else resolved_project_dir
     )
 
-    security_profile = get_security_profile(resolved_project_dir, resolved_spec_dir)
-    codex_security_config = CodexSecurityConfig.from_security_profile(
-        security_profile,
-        allowed_paths=["./**"],
-    )
-    codex_security_args = codex_security_config.to_codex_args()
+    codex_security_args = _build_security_args(resolved_project_dir, resolved_spec_dir)
 
     reasoning_effort = _infer_reasoning_effort(max_thinking_tokens)
 
@@ -164,7 +188,7 @@ def create_client(
     client = CodexCliClient(
         model=model,  # Will use AUTO_BUILD_MODEL env var if None
         reasoning_effort=reasoning_effort,
-        workdir=str(resolved_project_dir),
+        workdir=resolved_project_dir,
         timeout=600,
         bypass_sandbox=(os.environ.get("AUTO_CODEX_BYPASS_CODEX_SANDBOX", "1") != "0"),
         extra_args=codex_security_args,
@@ -172,22 +196,98 @@ def create_client(
     return CodexClientAdapter(client)
 
 
+def _resolved(path: str | os.PathLike[str]) -> str:
+    """
+    Resolve a path, caching the symlink walk per absolute path.
+
+    `abspath` is string-only, so relative inputs are anchored to the current
+    directory before they reach the cache.
+    """
+    return _realpath(os.path.abspath(os.fspath(path)))
+
+
+@functools.lru_cache(maxsize=128)
+def _realpath(path_str: str) -> str:
+    """Resolve a path once per process; realpath stats every path component."""
+    return os.path.realpath(path_str)
+
+
+def _build_security_args(project_dir: str, spec_dir: str) -> tuple[str, ...]:
+    """
+    Compute Codex CLI security args for a project/spec pair.
+
+    Not cached here: `get_security_profile` owns the profile cache (and its
+    `reset_profile_cache()` hook), and `to_codex_args` reads the legacy-flags
+    env toggle on every call. The result is an immutable tuple handed to the
+    client as-is.
+    """
+    security_profile = get_security_profile(Path(project_dir), Path(spec_dir))
+    codex_security_config = CodexSecurityConfig.from_security_profile(
+        security_profile,
+        allowed_paths=list(_SECURITY_ALLOWED_PATHS),
+    )
+    return tuple(codex_security_config.to_codex_args())
+
+
 def get_client(provider: str = "codex", **kwargs) -> LLMClientProtocol:
-    """Return a provider-backed client instance."""
+    """
+    Return a provider-backed client instance.
+
+    Clients are cached per configuration, so repeated calls with the same
+    project directory and model reuse one instance.
+    """
     normalized = provider.lower()
     if normalized != "codex":
         raise ValueError(f"Unknown provider: {provider}")
 
     project_dir = kwargs.get("project_dir")
-    workdir = str(project_dir) if project_dir is not None else None
-    return CodexCliClient(
-        model=kwargs.get("model"),  # Will use AUTO_BUILD_MODEL env var if None
-        reasoning_effort=kwargs.get("reasoning_effort"),
-        workdir=workdir,
-        timeout=kwargs.get("timeout", 600),
-        bypass_sandbox=kwargs.get("bypass_sandbox", True),
-        extra_args=kwargs.get("extra_args"),
+    workdir = _resolved(project_dir) if project_dir is not None else os.getcwd()
+    # Resolve env-driven defaults up front so changing them yields a new client.
+    model = configured_model(kwargs.get("model"))
+    reasoning_effort = kwargs.get("reasoning_effort")
+    timeout = kwargs.get("timeout", 600)
+    bypass_sandbox = kwargs.get("bypass_sandbox", True)
+    extra_args = kwargs.get("extra_args")
+    worker_pool = worker_pool_enabled()
+
+    key = (
+        workdir,
+        model,
+        reasoning_effort,
+        timeout,
+        bypass_sandbox,
+        tuple(extra_args or ()),
+        worker_pool,
     )
+    with _CLIENT_CACHE_LOCK:
+        client = _CLIENT_CACHE.get(key)
+        if client is not None:
+            _CLIENT_CACHE.move_to_end(key)
+            return client
+        client = CodexCliClient(
+            model=model,
+            reasoning_effort=reasoning_effort,
+            workdir=workdir,
+            timeout=timeout,
+            bypass_sandbox=bypass_sandbox,
+            extra_args=extra_args,
+            worker_pool=worker_pool,
+        )
+        _CLIENT_CACHE[key] = client
+        if len(_CLIENT_CACHE) > _CLIENT_CACHE_SIZE:
+            _CLIENT_CACHE.popitem(last=False)
+    return client
+
+
+def clear_client_cache() -> None:
+    """
+    Drop all cached provider clients.
+
+    Clients already handed out keep working; later `get_client()` calls build
+    fresh ones.
+    """
+    with _CLIENT_CACHE_LOCK:
+        _CLIENT_CACHE.clear()
 
 
 def _infer_reasoning_effort(max_thinking_tokens: int | None) -> str | None:
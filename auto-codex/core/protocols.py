@@ -1,9 +1,10 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
-from enum import Enum
+from enum import StrEnum
 from typing import Any, AsyncIterator, Optional, Protocol
 
 
-class EventType(Enum):
+class EventType(StrEnum):
     TEXT = "text"
     TOOL_START = "tool_start"
     TOOL_RESULT = "tool_result"
@@ -12,7 +13,7 @@ class EventType(Enum):
     SESSION_END = "session_end"
 
 
-@dataclass
+@dataclass(slots=True)
 class LLMEvent:
     type: EventType
     data: dict[str, Any]
@@ -34,6 +35,18 @@ class LLMClientProtocol(Protocol):
         """Stream events from the session."""
         ...
 
+    async def stream_event_batches(
+        self, session_id: str
+    ) -> AsyncIterator[Sequence[LLMEvent]]:
+        """
+        Stream events from the session in batches (optional).
+
+        Providers that read output in bulk override this; the default yields
+        each `stream_events` event as its own batch.
+        """
+        async for event in self.stream_events(session_id):
+            yield (event,)
+
     async def close(self, session_id: str) -> None:
         """Close and cleanup a session."""
         ...
@@ -41,3 +54,23 @@ class LLMClientProtocol(Protocol):
     def is_available(self) -> bool:
         """Check if this provider is available (credentials, CLI installed, etc.)."""
         ...
+
+
+async def iter_event_batches(
+    client: LLMClientProtocol, session_id: str
+) -> AsyncIterator[Sequence[LLMEvent]]:
+    """
+    Stream a session's events in batches.
+
+    Uses `stream_event_batches` when the client's class provides it (as
+    LLMClientProtocol subclasses do); otherwise each event from
+    `stream_events` is its own batch. The lookup is on the class because mocks
+    fabricate any instance attribute, and a fabricated method would stream
+    nothing.
+    """
+    if getattr(type(client), "stream_event_batches", None) is not None:
+        async for batch in client.stream_event_batches(session_id):
+            yield batch
+        return
+    async for event in client.stream_events(session_id):
+        yield (event,)
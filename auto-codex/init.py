@@ -8,6 +8,10 @@ from __future__ import annotations
 
 from pathlib import Path
 
+# .auto-codex directories whose gitignore state was already handled in this
+# process, so repeated init calls skip the marker-file check.
+_CHECKED_DIRS: set[Path] = set()
+
 
 def ensure_gitignore_entry(project_dir: Path, entry: str = ".auto-codex/") -> bool:
     """
@@ -23,43 +27,30 @@ def ensure_gitignore_entry(project_dir: Path, entry: str = ".auto-codex/") -> bo
         True if entry was added, False if it already existed
     """
     gitignore_path = project_dir / ".gitignore"
+    block = b"# Auto Codex data directory\n" + entry.encode() + b"\n"
 
-    # Check if .gitignore exists and if entry is already present
-    if gitignore_path.exists():
-        content = gitignore_path.read_text()
-        lines = content.splitlines()
-
-        # Check if entry already exists (exact match or with trailing newline variations)
-        entry_normalized = entry.rstrip("/")
-        for line in lines:
-            line_stripped = line.strip()
-            # Match both ".auto-codex" and ".auto-codex/"
-            if (
-                line_stripped == entry
-                or line_stripped == entry_normalized
-                or line_stripped == entry_normalized + "/"
-            ):
-                return False  # Already exists
-
-        # Entry doesn't exist, append it
-        # Ensure file ends with newline before adding our entry
-        if content and not content.endswith("\n"):
-            content += "\n"
-
-        # Add a comment and the entry
-        content += "\n# Auto Codex data directory\n"
-        content += entry + "\n"
-
-        gitignore_path.write_text(content)
-        return True
-    else:
+    try:
+        raw = gitignore_path.read_bytes()
+    except FileNotFoundError:
         # Create new .gitignore with the entry
-        content = "# Auto Codex data directory\n"
-        content += entry + "\n"
-
-        gitignore_path.write_text(content)
+        gitignore_path.write_bytes(block)
         return True
 
+    # Check if entry already exists (match both ".auto-codex" and ".auto-codex/")
+    content = raw.decode("utf-8", errors="replace")
+    entry_normalized = entry.rstrip("/")
+    candidates = {entry, entry_normalized, entry_normalized + "/"}
+    existing = {line.strip() for line in content.splitlines()}
+    if candidates & existing:
+        return False  # Already exists
+
+    # Entry doesn't exist: append only the new lines instead of rewriting the
+    # file. Ensure the existing content ends with a newline first.
+    prefix = b"\n" if raw and not raw.endswith(b"\n") else b""
+    with gitignore_path.open("ab") as f:
+        f.write(prefix + b"\n" + block)
+    return True
+
 
 def init_auto_codex_dir(project_dir: Path) -> tuple[Path, bool]:
     """
@@ -75,21 +66,27 @@ def init_auto_codex_dir(project_dir: Path) -> tuple[Path, bool]:
     """
     project_dir = Path(project_dir)
     auto_codex_dir = project_dir / ".auto-codex"
+    # Key on the resolved path so relative inputs don't alias across chdir()
+    checked_key = auto_codex_dir.resolve()
+    checked = checked_key in _CHECKED_DIRS
 
     # Migration: if a legacy `.auto-claude/` folder exists, rename it in-place.
     legacy_dir = project_dir / ".auto-claude"
-    if not auto_codex_dir.exists() and legacy_dir.exists():
+    if not checked and not auto_codex_dir.exists() and legacy_dir.exists():
         legacy_dir.rename(auto_codex_dir)
 
-    # Create the directory if it doesn't exist
-    dir_created = not auto_codex_dir.exists()
-    auto_codex_dir.mkdir(parents=True, exist_ok=True)
+    # Create the directory if it doesn't exist (mkdir doubles as the existence check)
+    try:
+        auto_codex_dir.mkdir(parents=True)
+        dir_created = True
+    except FileExistsError:
+        dir_created = False
 
     # Ensure .auto-codex is in .gitignore (only on first creation)
     gitignore_updated = False
     if dir_created:
         gitignore_updated = ensure_gitignore_entry(project_dir, ".auto-codex/")
-    else:
+    elif not checked:
         # Even if dir exists, check gitignore on first run
         # Use a marker file to track if we've already checked
         marker = auto_codex_dir / ".gitignore_checked"
@@ -97,6 +94,7 @@ def init_auto_codex_dir(project_dir: Path) -> tuple[Path, bool]:
             gitignore_updated = ensure_gitignore_entry(project_dir, ".auto-codex/")
             marker.touch()
 
+    _CHECKED_DIRS.add(checked_key)
     return auto_codex_dir, gitignore_updated
 
 
@@ -11,16 +11,85 @@ configured to use the provider abstraction layer.
 from __future__ import annotations
 
 import asyncio
+import atexit
+import concurrent.futures
 import logging
 import sys
-from typing import TYPE_CHECKING
+import threading
+from collections.abc import Coroutine
+from typing import TYPE_CHECKING, Any
 
 if TYPE_CHECKING:
+    from core.protocols import LLMClientProtocol
+
     from .resolver import AIResolver
 
 logger = logging.getLogger(__name__)
 
 
+async def _cancel_pending_tasks() -> None:
+    current = asyncio.current_task()
+    tasks = [task for task in asyncio.all_tasks() if task is not current]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+class _LoopRunner:
+    """
+    Long-lived event loop on a daemon thread for synchronous merge calls.
+
+    The resolver API is synchronous, so each conflict used to pay for a fresh
+    `asyncio.run()` loop. All merge calls now share this loop instead.
+    """
+
+    _instance: _LoopRunner | None = None
+    _lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self.loop.run_forever,
+            name="merge-llm-loop",
+            daemon=True,
+        )
+        self._thread.start()
+
+    @classmethod
+    def get(cls) -> _LoopRunner:
+        with cls._lock:
+            if cls._instance is None:
+                cls._instance = cls()
+                atexit.register(cls.shutdown)
+            return cls._instance
+
+    @classmethod
+    def submit(cls, coro: Coroutine[Any, Any, Any]) -> concurrent.futures.Future:
+        """Schedule a coroutine on the shared loop."""
+        return asyncio.run_coroutine_threadsafe(coro, cls.get().loop)
+
+    @classmethod
+    def shutdown(cls) -> None:
+        """Stop the shared loop and join its thread."""
+        with cls._lock:
+            runner = cls._instance
+            cls._instance = None
+        if runner is None:
+            return
+        # Cancel leftover tasks first, as asyncio.run() does, so their cleanup
+        # (e.g. stopping Codex pool workers bound to this loop) gets to run.
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel_pending_tasks(), runner.loop).result(
+                timeout=5
+            )
+        except Exception:
+            pass
+        runner.loop.call_soon_threadsafe(runner.loop.stop)
+        runner._thread.join(timeout=5)
+        if not runner.loop.is_running():
+            runner.loop.close()
+
+
 def create_llm_resolver() -> AIResolver:
     """
     Create an AIResolver configured to use the provider abstraction layer.
@@ -33,37 +102,46 @@ def create_llm_resolver() -> AIResolver:
 
     from .resolver import AIResolver
 
-    def call_llm(system: str, user: str) -> str:
-        """Call the configured provider for merge resolution."""
+    shared_client: LLMClientProtocol | None = None
+
+    def _get_shared_client() -> LLMClientProtocol:
+        # One provider client per resolver, reused for every conflict.
+        nonlocal shared_client
+        if shared_client is None:
+            shared_client = get_client()
+        return shared_client
+
+    async def _run_merge(system: str, user: str) -> str:
+        prompt = f"{system}\n\n{user}"
+        client = _get_shared_client()
+        if not client.is_available():
+            logger.warning("LLM provider unavailable, AI resolution disabled")
+            return ""
 
-        async def _run_merge() -> str:
-            prompt = f"{system}\n\n{user}"
-            client = get_client()
-            if not client.is_available():
-                logger.warning("LLM provider unavailable, AI resolution disabled")
-                return ""
-
-            try:
-                session_id = await client.start_session(prompt)
-                response_text = ""
-                async for event in client.stream_events(session_id):
-                    if event.type.value == "text":
-                        response_text += (
-                            event.data.get("content")
-                            or event.data.get("text")
-                            or ""
-                        )
-                logger.info(f"AI merge response: {len(response_text)} chars")
-                return response_text
-            except Exception as e:
-                logger.error(f"LLM call failed: {e}")
-                print(f"    [ERROR] LLM error: {e}", file=sys.stderr)
-                return ""
+        try:
+            session_id = await client.start_session(prompt)
+            parts: list[str] = []
+            async for event in client.stream_events(session_id):
+                if event.type.value == "text":
+                    parts.append(
+                        event.data.get("content")
+                        or event.data.get("text")
+                        or ""
+                    )
+            response_text = "".join(parts)
+            logger.info(f"AI merge response: {len(response_text)} chars")
+            return response_text
+        except Exception as e:
+            logger.error(f"LLM call failed: {e}")
+            print(f"    [ERROR] LLM error: {e}", file=sys.stderr)
+            return ""
 
+    def call_llm(system: str, user: str) -> str:
+        """Call the configured provider for merge resolution."""
         try:
-            return asyncio.run(_run_merge())
+            return _LoopRunner.submit(_run_merge(system, user)).result()
         except Exception as e:
-            logger.error(f"asyncio.run failed: {e}")
+            logger.error(f"Merge loop failed: {e}")
             print(f"    [ERROR] asyncio error: {e}", file=sys.stderr)
             return ""
 
@@ -1,14 +1,28 @@
 import asyncio
+import functools
+import itertools
 import json
 import os
 import shutil
-import uuid
+import signal
+import sys
+import weakref
+from collections.abc import Iterable
 from dataclasses import dataclass
 from typing import Any, AsyncIterator, Optional
 
 from core.auth import get_auth_token
 from core.protocols import EventType, LLMClientProtocol, LLMEvent
 
+# Bound once like the event types below; json.loads accepts the raw bytes.
+_json_loads = json.loads
+
+# Event types bound once at import; the output parser uses them for every line.
+_T_TEXT = EventType.TEXT
+_T_TOOL_START = EventType.TOOL_START
+_T_TOOL_RESULT = EventType.TOOL_RESULT
+_T_ERROR = EventType.ERROR
+
 # Valid reasoning effort levels
 VALID_REASONING_EFFORTS = ("low", "medium", "high", "xhigh")
 
@@ -32,6 +46,32 @@ DEFAULT_REASONING_EFFORT = (
     else None
 )
 
+# Opt-in: serve prompts from long-lived `codex repl --json` workers instead of
+# spawning `codex exec` per session. Requires a Codex CLI with a REPL mode.
+WORKER_POOL_ENV_VAR = "AUTO_CODEX_CODEXCLI_WORKER_POOL"
+WORKER_POOL_SIZE = min(os.cpu_count() or 1, 4)
+
+# Bytes pulled from the Codex CLI stdout per read in stream_events
+_READ_CHUNK_SIZE = 65536
+
+# Session IDs are only keys into per-client session tables, not secrets; a
+# process-wide counter keeps them unique across clients without a CSPRNG read.
+_SESSION_IDS = itertools.count()
+# The pid part of session IDs, formatted once; refreshed in forked children
+_SESSION_PREFIX = f"{os.getpid()}-"
+
+
+def _reset_session_prefix() -> None:
+    global _SESSION_PREFIX
+    _SESSION_PREFIX = f"{os.getpid()}-"
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_session_prefix)
+
+# Stderr kept for error reporting; anything beyond this is read and dropped
+_STDERR_CAP = 65536
+
 # Common codex installation paths (for GUI apps that don't inherit shell PATH)
 CODEX_SEARCH_PATHS = [
     "/opt/homebrew/bin/codex",  # macOS ARM (Homebrew)
@@ -72,12 +112,15 @@ def get_gui_env() -> dict[str, str]:
     return env
 
 
+@functools.lru_cache(maxsize=1)
 def find_codex_path() -> str | None:
     """
     Find the codex CLI executable path.
 
     First tries shutil.which (works in terminal), then falls back to
     common installation paths (needed for GUI apps launched from Finder).
+    The result is cached for the life of the process; see
+    `CodexCliClient.invalidate_availability()`.
     """
     # Try PATH first (works in terminal)
     codex_path = shutil.which("codex")
@@ -92,6 +135,36 @@ def find_codex_path() -> str | None:
     return None
 
 
+@functools.cache
+def _auth_ok() -> bool:
+    """Cached check that some Codex auth source is configured."""
+    return bool(get_auth_token())
+
+
+def _as_text(line: bytes | bytearray | str) -> str:
+    if isinstance(line, (bytes, bytearray)):
+        return line.decode(errors="replace")
+    return line
+
+
+async def _drain_stderr(stream: asyncio.StreamReader) -> bytes:
+    """Read stderr to EOF so the child never blocks on a full pipe."""
+    buf = bytearray()
+    while chunk := await stream.read(_READ_CHUNK_SIZE):
+        room = _STDERR_CAP - len(buf)
+        if room > 0:
+            buf += chunk[:room]
+    return bytes(buf)
+
+
+def _is_end_frame(line: bytes, session_id: str) -> bool:
+    try:
+        data = _json_loads(line)
+    except ValueError:
+        return False
+    return isinstance(data, dict) and data.get("type") == "end" and data.get("id") == session_id
+
+
 def parse_model_string(model_str: str) -> tuple[str, str | None, bool]:
     """
     Parse a model string that may include reasoning effort suffix.
@@ -115,6 +188,75 @@ def parse_model_string(model_str: str) -> tuple[str, str | None, bool]:
     return (model_str, DEFAULT_REASONING_EFFORT, False)
 
 
+# =============================================================================
+# OUTPUT EVENT HANDLERS
+# =============================================================================
+
+
+def _on_message(data: dict[str, Any]) -> Optional[LLMEvent]:
+    # The parsed line is discarded after this, so hand it over as the payload
+    # rather than copying "content" into a fresh dict.
+    data.setdefault("content", "")
+    return LLMEvent(type=_T_TEXT, data=data)
+
+
+def _on_tool_use(data: dict[str, Any]) -> Optional[LLMEvent]:
+    return LLMEvent(type=_T_TOOL_START, data=data)
+
+
+def _on_tool_result(data: dict[str, Any]) -> Optional[LLMEvent]:
+    return LLMEvent(type=_T_TOOL_RESULT, data=data)
+
+
+def _on_error(data: dict[str, Any]) -> Optional[LLMEvent]:
+    return LLMEvent(type=_T_ERROR, data=data)
+
+
+def _on_item_completed(data: dict[str, Any]) -> Optional[LLMEvent]:
+    # New Codex CLI event types (v0.77+)
+    item = data.get("item", {})
+    item_type = item.get("type", "")
+    text = item.get("text", "")
+    if item_type == "agent_message" and text:
+        return LLMEvent(type=_T_TEXT, data={"content": text})
+    if item_type == "tool_use":
+        return LLMEvent(type=_T_TOOL_START, data={"name": item.get("name", "tool"), "input": item.get("input")})
+    if item_type == "tool_result":
+        return LLMEvent(type=_T_TOOL_RESULT, data={"content": item.get("output")})
+    # Skip reasoning items silently
+    return None
+
+
+def _skip_event(data: dict[str, Any]) -> Optional[LLMEvent]:
+    return None
+
+
+# Codex CLI "type" field -> handler. Unknown types are surfaced as raw text.
+_EVENT_DISPATCH = {
+    # Legacy event types
+    "message": _on_message,
+    "tool_use": _on_tool_use,
+    "tool_result": _on_tool_result,
+    "error": _on_error,
+    "item.completed": _on_item_completed,
+    # Lifecycle events carry no content
+    "thread.started": _skip_event,
+    "turn.started": _skip_event,
+    "turn.completed": _skip_event,
+    "item.started": _skip_event,
+}
+
+
+def configured_model(model: str | None = None) -> str:
+    """Return the model string a client would use: explicit, else AUTO_BUILD_MODEL."""
+    return model or os.environ.get("AUTO_BUILD_MODEL", DEFAULT_MODEL)
+
+
+def worker_pool_enabled() -> bool:
+    """Return True if the persistent Codex worker pool is enabled via env."""
+    return os.environ.get(WORKER_POOL_ENV_VAR, "").strip().lower() in ("true", "1", "yes")
+
+
 @dataclass
 class CodexSession:
     """Tracks a running Codex CLI session."""
@@ -123,6 +265,207 @@ class CodexSession:
     process: Optional[asyncio.subprocess.Process] = None
     workdir: str = ""
     closed: bool = False
+    pooled: bool = False
+
+
+class _ReadWatchdog:
+    """
+    Idle timeout for stream reads backed by one reusable timer.
+
+    `asyncio.wait_for` around every read allocates a timer (and on older
+    Pythons a Task) per call. Instead, a single loop timer checks whether the
+    read in flight has been waiting longer than `timeout` and, if so, cancels
+    the reading task; `guard()` turns that cancellation into TimeoutError.
+    The timer re-arms itself at most about once per timeout period. Time
+    spent by the consumer between reads doesn't count toward the timeout.
+    """
+
+    def __init__(self, timeout: float | None) -> None:
+        self._timeout = timeout if timeout and timeout > 0 else None
+        self._loop = asyncio.get_running_loop()
+        self._task: Optional[asyncio.Task] = None
+        self._read_started: Optional[float] = None
+        self._fired = False
+        self._handle: Optional[asyncio.TimerHandle] = None
+        if self._timeout is not None:
+            self._handle = self._loop.call_later(self._timeout, self._check)
+
+    async def guard(self, awaitable):
+        """Await a read, raising TimeoutError if it stays idle too long."""
+        if self._timeout is None:
+            return await awaitable
+        self._task = asyncio.current_task()
+        self._read_started = self._loop.time()
+        try:
+            return await awaitable
+        except asyncio.CancelledError:
+            # uncancel() > 0 means someone else cancelled us as well.
+            if not self._fired or self._task.uncancel() > 0:
+                raise
+            raise asyncio.TimeoutError from None
+        finally:
+            self._read_started = None
+
+    def cancel(self) -> None:
+        if self._handle is not None:
+            self._handle.cancel()
+            self._handle = None
+
+    def _check(self) -> None:
+        now = self._loop.time()
+        started = self._read_started
+        if started is None:
+            # Not reading right now; check again a full period from now.
+            self._handle = self._loop.call_at(now + self._timeout, self._check)
+            return
+        deadline = started + self._timeout
+        if now < deadline:
+            self._handle = self._loop.call_at(deadline, self._check)
+            return
+        self._handle = None
+        self._fired = True
+        self._task.cancel()
+
+
+def _kill_workers(workers: list[asyncio.subprocess.Process]) -> None:
+    """Kill workers by pid; usable after their event loop has closed."""
+    for process in workers:
+        if process.returncode is None:
+            try:
+                os.kill(process.pid, getattr(signal, "SIGKILL", signal.SIGTERM))
+            except OSError:
+                pass
+    workers.clear()
+
+
+def _kill_all_workers(loops: dict[Any, "_LoopWorkers"]) -> None:
+    for state in loops.values():
+        _kill_workers(state.workers)
+    loops.clear()
+
+
+@dataclass
+class _LoopWorkers:
+    """Workers and idle queue owned by one event loop."""
+
+    idle: asyncio.Queue
+    workers: list[asyncio.subprocess.Process]
+    reaper: Optional[asyncio.Task] = None
+
+
+class _CodexWorkerPool:
+    """
+    Long-lived Codex REPL workers that each serve one prompt at a time.
+
+    A request is written to a worker's stdin as one JSON line
+    (`{"prompt": ..., "id": ...}`); the worker streams the usual JSON events
+    and terminates the response with `{"type": "end", "id": ...}`.
+
+    Subprocess transports can't move between loops, so each event loop gets
+    its own set of up to `size` workers, spawned lazily. A parked reaper task
+    stops a loop's workers when the loop shuts down (`asyncio.run()` cancels
+    it on exit); loops closed without that are reaped by pid on the next use,
+    and anything left is killed at interpreter exit.
+    """
+
+    def __init__(self, command: list[str], workdir: str, size: int) -> None:
+        self.command = command
+        self.workdir = workdir
+        self.size = max(1, size)
+        self._loops: dict[asyncio.AbstractEventLoop, _LoopWorkers] = {}
+        weakref.finalize(self, _kill_all_workers, self._loops)
+
+    def _state(self) -> _LoopWorkers:
+        loop = asyncio.get_running_loop()
+        state = self._loops.get(loop)
+        if state is None:
+            for other_loop in [other for other in self._loops if other.is_closed()]:
+                _kill_workers(self._loops.pop(other_loop).workers)
+            state = _LoopWorkers(idle=asyncio.Queue(), workers=[])
+            state.reaper = loop.create_task(self._reap_at_loop_exit(loop, state))
+            self._loops[loop] = state
+        return state
+
+    async def _reap_at_loop_exit(
+        self, loop: asyncio.AbstractEventLoop, state: _LoopWorkers
+    ) -> None:
+        try:
+            await loop.create_future()
+        finally:
+            if self._loops.get(loop) is state:
+                del self._loops[loop]
+            workers, state.workers = state.workers, []
+            for process in workers:
+                if process.returncode is None:
+                    process.kill()
+                    await process.wait()
+
+    async def acquire(self) -> asyncio.subprocess.Process:
+        """Return an idle worker, spawning one if the pool has room."""
+        state = self._state()
+        while True:
+            if state.idle.empty() and len(state.workers) < self.size:
+                process = await asyncio.create_subprocess_exec(
+                    *self.command,
+                    stdin=asyncio.subprocess.PIPE,
+                    stdout=asyncio.subprocess.PIPE,
+                    # Nobody drains a long-lived worker's stderr; a pipe would
+                    # eventually fill and stall it.
+                    stderr=asyncio.subprocess.DEVNULL,
+                    cwd=self.workdir,
+                    env=get_gui_env(),
+                )
+                state.workers.append(process)
+                return process
+
+            # None is a wake-up token: a slot was freed, so re-check for room.
+            process = await state.idle.get()
+            if process is None:
+                continue
+            if process.returncode is None:
+                return process
+            self._forget(state, process, wake=False)
+
+    def release(self, process: asyncio.subprocess.Process) -> None:
+        """Return a worker that finished its response to the idle queue."""
+        state = self._state()
+        if process.returncode is not None:
+            self._forget(state, process)
+            return
+        state.idle.put_nowait(process)
+
+    def discard(self, process: asyncio.subprocess.Process) -> None:
+        """Kill a worker whose output stream can no longer be trusted."""
+        if process.returncode is None:
+            process.kill()
+        self._forget(self._state(), process)
+
+    def workers(self) -> list[asyncio.subprocess.Process]:
+        """Workers owned by the running loop."""
+        return list(self._state().workers)
+
+    async def aclose(self) -> None:
+        """Stop all workers, each on the loop that owns it."""
+        loop = asyncio.get_running_loop()
+        for owner, state in list(self._loops.items()):
+            if owner is loop:
+                state.reaper.cancel()
+                await asyncio.gather(state.reaper, return_exceptions=True)
+            elif owner.is_closed():
+                _kill_workers(state.workers)
+            else:
+                owner.call_soon_threadsafe(state.reaper.cancel)
+        self._loops.clear()
+
+    @staticmethod
+    def _forget(
+        state: _LoopWorkers, process: asyncio.subprocess.Process, wake: bool = True
+    ) -> None:
+        if process in state.workers:
+            state.workers.remove(process)
+            if wake:
+                # Wake a caller blocked in acquire() so it can spawn a replacement.
+                state.idle.put_nowait(None)
 
 
 class CodexCliClient(LLMClientProtocol):
@@ -135,23 +478,28 @@ class CodexCliClient(LLMClientProtocol):
         workdir: Optional[str] = None,
         timeout: int = 600,
         bypass_sandbox: bool = True,
-        extra_args: Optional[list[str]] = None,
+        extra_args: Optional[Iterable[str]] = None,
+        worker_pool: Optional[bool] = None,
     ) -> None:
         # Parse model string to extract base model and (optional) reasoning effort.
         # We treat any "-low/-medium/-high/-xhigh" suffix as legacy input and
         # always translate it into `model_reasoning_effort` instead of passing
         # a synthetic model name to the Codex CLI.
-        raw_model = model or os.environ.get("AUTO_BUILD_MODEL", DEFAULT_MODEL)
+        raw_model = configured_model(model)
         parsed_model, parsed_effort, _has_suffix = parse_model_string(raw_model)
 
         explicit_effort = normalize_reasoning_effort(reasoning_effort) if reasoning_effort else None
-        self.model = parsed_model
+        # Interned so clients for the same model share one string object.
+        self.model = sys.intern(parsed_model)
         self.reasoning_effort = explicit_effort or parsed_effort
         self.workdir = workdir or os.getcwd()
         self.timeout = timeout
         self.bypass_sandbox = bypass_sandbox
-        self.extra_args = extra_args or []
+        # Immutable, so callers can share one cached args tuple across clients.
+        self.extra_args: tuple[str, ...] = tuple(extra_args) if extra_args else ()
+        self.worker_pool = worker_pool_enabled() if worker_pool is None else worker_pool
         self._sessions: dict[str, CodexSession] = {}
+        self._pool: Optional[_CodexWorkerPool] = None
 
     def is_available(self) -> bool:
         """
@@ -161,17 +509,30 @@ class CodexCliClient(LLMClientProtocol):
         - OPENAI_API_KEY
         - CODEX_CODE_OAUTH_TOKEN
         - CODEX_CONFIG_DIR
+
+        Results are cached; see `invalidate_availability()`.
         """
-        if not find_codex_path():
-            return False
+        return find_codex_path() is not None and _auth_ok()
 
-        return bool(get_auth_token())
+    @classmethod
+    def invalidate_availability(cls) -> None:
+        """
+        Forget cached availability results.
+
+        `is_available()` caches the codex lookup and auth check for the life of
+        the process; call this after changing PATH or auth env vars.
+        """
+        find_codex_path.cache_clear()
+        _auth_ok.cache_clear()
 
     async def start_session(self, prompt: str, **kwargs) -> str:
         """Start a new Codex CLI session."""
-        session_id = str(uuid.uuid4())
-        cmd = self._build_command(prompt, **kwargs)
+        session_id = f"{_SESSION_PREFIX}{next(_SESSION_IDS)}"
         workdir = kwargs.get("workdir", self.workdir)
+        if self.worker_pool and workdir == self.workdir:
+            return await self._start_pooled_session(session_id, prompt)
+
+        cmd = self._build_command(prompt, **kwargs)
 
         process = await asyncio.create_subprocess_exec(
             *cmd,
@@ -192,26 +553,53 @@ class CodexCliClient(LLMClientProtocol):
         )
         return session_id
 
+    async def _start_pooled_session(self, session_id: str, prompt: str) -> str:
+        """Dispatch a prompt to an idle pool worker."""
+        if self._pool is None:
+            self._pool = _CodexWorkerPool(
+                self._build_worker_command(), self.workdir, WORKER_POOL_SIZE
+            )
+        process = await self._pool.acquire()
+
+        # Each worker handles a single request at a time, so there is nothing
+        # to interleave with; skip drain() and let the transport flush.
+        request = json.dumps({"prompt": prompt, "id": session_id})
+        process.stdin.write(request.encode() + b"\n")
+
+        self._sessions[session_id] = CodexSession(
+            session_id=session_id, process=process, workdir=self.workdir, pooled=True
+        )
+        return session_id
+
     def _build_command(self, prompt: str, **kwargs) -> list[str]:
         """Build the codex CLI command."""
         # Use full path to codex (needed for GUI apps launched from Finder)
         codex_path = find_codex_path() or "codex"
-        cmd = [codex_path, "exec"]
+        cmd = [codex_path, "exec", *self._build_common_args()]
+        cmd.append("-")
+        return cmd
+
+    def _build_worker_command(self) -> list[str]:
+        """Build the command for a persistent REPL worker."""
+        codex_path = find_codex_path() or "codex"
+        return [codex_path, "repl", *self._build_common_args()]
+
+    def _build_common_args(self) -> list[str]:
+        args: list[str] = []
 
         if self.bypass_sandbox:
-            cmd.append("--dangerously-bypass-approvals-and-sandbox")
+            args.append("--dangerously-bypass-approvals-and-sandbox")
 
         # Model name (e.g., gpt-5.2-codex, gpt-4o)
-        cmd.extend(["-m", self.model])
+        args.extend(["-m", self.model])
 
         # Reasoning effort level (low, medium, high, xhigh)
         if self.reasoning_effort:
-            cmd.extend(["-c", f"model_reasoning_effort={self.reasoning_effort}"])
+            args.extend(["-c", f"model_reasoning_effort={self.reasoning_effort}"])
 
-        cmd.append("--json")
-        cmd.extend(self.extra_args)
-        cmd.append("-")
-        return cmd
+        args.append("--json")
+        args.extend(self.extra_args)
+        return args
 
     async def send(self, session_id: str, message: str) -> None:
         """Send input to the session's stdin."""
@@ -219,6 +607,11 @@ class CodexCliClient(LLMClientProtocol):
         if not session or not session.process or session.closed:
             raise ValueError(f"Session {session_id} not found")
 
+        if session.pooled:
+            # Pooled workers speak a JSON-lines request protocol on stdin; raw
+            # input would desync the worker for its next session.
+            raise RuntimeError("Cannot send input to a pooled Codex session")
+
         if not session.process.stdin:
             raise RuntimeError("Session stdin is not available")
 
@@ -227,108 +620,194 @@ class CodexCliClient(LLMClientProtocol):
 
     async def stream_events(self, session_id: str) -> AsyncIterator[LLMEvent]:
         """Stream and parse Codex CLI JSON output."""
+        async for batch in self.stream_event_batches(session_id):
+            for event in batch:
+                yield event
+
+    async def stream_event_batches(self, session_id: str) -> AsyncIterator[list[LLMEvent]]:
+        """
+        Stream Codex CLI events grouped by stdout read.
+
+        Every event parsed from one read arrives in the same list, so a
+        consumer that walks each batch inline resumes once per read rather
+        than once per event. `stream_events` is the per-event view.
+        """
         session = self._sessions.get(session_id)
         if not session or not session.process:
             raise ValueError(f"Session {session_id} not found")
 
-        process = session.process
-        yield LLMEvent(type=EventType.SESSION_START, data={"session_id": session_id})
+        if session.pooled:
+            async for event in self._stream_pooled_events(session):
+                yield [event]
+            return
 
+        process = session.process
+        # Drain stderr concurrently: a verbose child would otherwise stall on
+        # a full stderr pipe while we wait on stdout.
+        stderr_task = asyncio.create_task(_drain_stderr(process.stderr)) if process.stderr else None
+        yield [LLMEvent(type=EventType.SESSION_START, data={"session_id": session_id})]
+
+        # Read stdout in bulk and split lines locally: one read per buffered
+        # batch rather than per emitted JSON line. A single watchdog timer
+        # bounds how long each read may wait for *new* output.
+        # Lines stay `bytes` all the way into the parser; only plain-text
+        # fallbacks are decoded. A line spanning several reads is collected in
+        # `partial` and joined once, so long lines aren't re-copied per chunk.
+        partial: list[bytes] = []
+        watchdog = _ReadWatchdog(self.timeout)
         try:
             while True:
                 try:
-                    if self.timeout and self.timeout > 0:
-                        line = await asyncio.wait_for(
-                            process.stdout.readline(), timeout=self.timeout
-                        )
-                    else:
-                        line = await process.stdout.readline()
+                    chunk = await watchdog.guard(process.stdout.read(_READ_CHUNK_SIZE))
                 except asyncio.TimeoutError:
-                    yield LLMEvent(
-                        type=EventType.ERROR,
-                        data={"error": "timeout waiting for output"},
-                    )
+                    yield [
+                        LLMEvent(
+                            type=_T_ERROR,
+                            data={"error": "timeout waiting for output"},
+                        )
+                    ]
                     await self._terminate_process(process)
                     break
 
-                if not line:
+                if not chunk:
                     break
 
-                event = self._parse_output_line(line.decode(errors="replace").strip())
+                partial.append(chunk)
+                if b"\n" not in chunk:
+                    continue
+                lines = (b"".join(partial) if len(partial) > 1 else chunk).split(b"\n")
+                tail = lines.pop()
+                partial = [tail] if tail else []
+                batch = []
+                for line in lines:
+                    # bytes.strip() returns the same object when there is
+                    # nothing to strip, so the common case doesn't copy.
+                    event = self._parse_output_line(line.strip())
+                    if event:
+                        batch.append(event)
+                if batch:
+                    yield batch
+
+            if partial:
+                event = self._parse_output_line(b"".join(partial).strip())
                 if event:
-                    yield event
+                    yield [event]
         except Exception as exc:
-            yield LLMEvent(type=EventType.ERROR, data={"error": str(exc)})
+            yield [LLMEvent(type=_T_ERROR, data={"error": str(exc)})]
+        finally:
+            watchdog.cancel()
 
+        # Exit status, any error and SESSION_END go out as one final batch.
+        batch = []
         returncode = process.returncode
         if returncode is None:
             returncode = await process.wait()
         if returncode != 0:
-            stderr = ""
-            if process.stderr:
-                stderr = (await process.stderr.read()).decode(errors="replace").strip()
-            yield LLMEvent(
-                type=EventType.ERROR,
-                data={"error": "process exited with error", "returncode": returncode, "stderr": stderr},
+            stderr = b""
+            if stderr_task is not None:
+                try:
+                    stderr = await asyncio.wait_for(stderr_task, 1.0)
+                except Exception:
+                    pass
+            batch.append(
+                LLMEvent(
+                    type=_T_ERROR,
+                    data={
+                        "error": "process exited with error",
+                        "returncode": returncode,
+                        "stderr": stderr.decode(errors="replace").strip(),
+                    },
+                )
             )
+        elif stderr_task is not None:
+            stderr_task.cancel()
+
+        await self.close(session_id)
+        batch.append(LLMEvent(type=EventType.SESSION_END, data={"session_id": session_id}))
+        yield batch
+
+    async def _stream_pooled_events(self, session: CodexSession) -> AsyncIterator[LLMEvent]:
+        """Stream one framed response from a pool worker, then release it."""
+        session_id = session.session_id
+        process = session.process
+        yield LLMEvent(type=EventType.SESSION_START, data={"session_id": session_id})
+
+        error: Optional[str] = None
+        watchdog = _ReadWatchdog(self.timeout)
+        try:
+            while True:
+                try:
+                    line = await watchdog.guard(process.stdout.readline())
+                except asyncio.TimeoutError:
+                    error = "timeout waiting for output"
+                    break
+
+                if not line:
+                    error = "worker exited before completing the response"
+                    break
+
+                line = line.strip()
+                if b'"end"' in line and _is_end_frame(line, session_id):
+                    # Response complete: the worker goes back to the pool and
+                    # the session no longer owns it.
+                    session.process = None
+                    self._pool.release(process)
+                    break
+
+                event = self._parse_output_line(line)
+                if event:
+                    yield event
+        except Exception as exc:
+            error = str(exc)
+        finally:
+            watchdog.cancel()
+
+        if error:
+            yield LLMEvent(type=_T_ERROR, data={"error": error})
 
         await self.close(session_id)
         yield LLMEvent(type=EventType.SESSION_END, data={"session_id": session_id})
 
-    def _parse_output_line(self, line: str) -> Optional[LLMEvent]:
-        """Parse a single line of Codex CLI JSON output."""
+    def _parse_output_line(self, line: bytes | str) -> Optional[LLMEvent]:
+        """
+        Parse a single line of Codex CLI JSON output.
+
+        Accepts raw bytes from the subprocess (the JSON parser handles them directly);
+        lines are only decoded when they fall back to plain text.
+        """
         if not line:
             return None
 
         try:
-            data = json.loads(line)
-        except json.JSONDecodeError:
-            return LLMEvent(type=EventType.TEXT, data={"content": line})
-
-        event_type = data.get("type", "")
-
-        # Legacy event types
-        if event_type == "message":
-            return LLMEvent(type=EventType.TEXT, data={"content": data.get("content", "")})
-        if event_type == "tool_use":
-            return LLMEvent(type=EventType.TOOL_START, data=data)
-        if event_type == "tool_result":
-            return LLMEvent(type=EventType.TOOL_RESULT, data=data)
-        if event_type == "error":
-            return LLMEvent(type=EventType.ERROR, data=data)
-
-        # New Codex CLI event types (v0.77+)
-        if event_type == "item.completed":
-            item = data.get("item", {})
-            item_type = item.get("type", "")
-            text = item.get("text", "")
-            if item_type == "agent_message" and text:
-                return LLMEvent(type=EventType.TEXT, data={"content": text})
-            if item_type == "tool_use":
-                return LLMEvent(type=EventType.TOOL_START, data={"name": item.get("name", "tool"), "input": item.get("input")})
-            if item_type == "tool_result":
-                return LLMEvent(type=EventType.TOOL_RESULT, data={"content": item.get("output")})
-            # Skip reasoning items silently
-            return None
-
-        # Skip lifecycle events (thread.started, turn.started, turn.completed, item.started)
-        if event_type in ("thread.started", "turn.started", "turn.completed", "item.started"):
-            return None
+            data = _json_loads(line)
+        except ValueError:
+            return LLMEvent(type=_T_TEXT, data={"content": _as_text(line)})
 
-        return LLMEvent(type=EventType.TEXT, data={"raw": line})
+        handler = _EVENT_DISPATCH.get(data.get("type", "")) if isinstance(data, dict) else None
+        if handler is None:
+            return LLMEvent(type=_T_TEXT, data={"raw": _as_text(line)})
+        return handler(data)
 
     async def close(self, session_id: str) -> None:
-        """Close and cleanup a session."""
-        session = self._sessions.get(session_id)
-        if not session or session.closed:
-            self._sessions.pop(session_id, None)
+        """Close and cleanup a session. Closing an unknown session is a no-op."""
+        session = self._sessions.pop(session_id, None)
+        if session is None or session.closed:
             return
+        session.closed = True
 
-        if session.process:
+        if session.pooled:
+            # A worker still attached here stopped mid-response; its stdout
+            # can't be reused for another request.
+            if session.process and self._pool:
+                self._pool.discard(session.process)
+        elif session.process:
             await self._terminate_process(session.process)
 
-        session.closed = True
-        self._sessions.pop(session_id, None)
+    async def shutdown_workers(self) -> None:
+        """Stop any persistent pool workers owned by this client."""
+        if self._pool:
+            await self._pool.aclose()
+            self._pool = None
 
     async def _terminate_process(self, process: asyncio.subprocess.Process) -> None:
         if process.returncode is not None:
@@ -5,9 +5,19 @@ Provider-backed client wrapper for AI analysis.
 from pathlib import Path
 
 from core.client import get_client
-from core.protocols import EventType
+from core.protocols import EventType, iter_event_batches
 
-LLM_AVAILABLE = get_client().is_available()
+
+def __getattr__(name: str):
+    """
+    Resolve LLM_AVAILABLE on access so importing doesn't probe the provider.
+
+    Not memoized here: `is_available()` has its own cache, which
+    `CodexCliClient.invalidate_availability()` can reset.
+    """
+    if name == "LLM_AVAILABLE":
+        return get_client().is_available()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class LLMAnalysisClient:
@@ -63,12 +73,11 @@ class LLMAnalysisClient:
         Returns:
             Collected response text
         """
-        response_text = ""
+        parts: list[str] = []
 
-        async for event in self.client.stream_events(session_id):
-            if event.type == EventType.TEXT:
-                response_text += (
-                    event.data.get("content") or event.data.get("text") or ""
-                )
+        async for batch in iter_event_batches(self.client, session_id):
+            for event in batch:
+                if event.type == EventType.TEXT:
+                    parts.append(event.data.get("content") or event.data.get("text") or "")
 
-        return response_text
+        return "".join(parts)
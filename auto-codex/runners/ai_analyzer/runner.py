@@ -9,7 +9,8 @@ from typing import Any
 
 from .analyzers import AnalyzerFactory
 from .cache_manager import CacheManager
-from .llm_client import LLM_AVAILABLE, LLMAnalysisClient
+from . import llm_client
+from .llm_client import LLMAnalysisClient
 from .cost_estimator import CostEstimator
 from .models import AnalyzerType
 from .result_parser import ResultParser
@@ -54,7 +55,7 @@ class AIAnalyzerRunner:
         if cached_result:
             return cached_result
 
-        if not LLM_AVAILABLE:
+        if not llm_client.LLM_AVAILABLE:
             print("✗ LLM provider not available. Cannot run AI analysis.")
             return {"error": "LLM provider not available"}
 
@@ -170,6 +170,38 @@ def provider_switch(monkeypatch: pytest.MonkeyPatch):
     return _switch
 
 
+# =============================================================================
+# ENVIRONMENT FIXTURES
+# =============================================================================
+
+@pytest.fixture
+def set_env() -> Generator:
+    """
+    Apply an env mapping in one call: a value is set, None is removed.
+
+    Prior values are appended to a local list and restored in reverse at
+    teardown, like monkeypatch but without its insert-at-front undo stack.
+    """
+    saved: list[tuple[str, str | None]] = []
+
+    def _set_env(mapping: dict[str, str | None]) -> None:
+        environ = os.environ
+        for name, value in mapping.items():
+            saved.append((name, environ.get(name)))
+            if value is None:
+                environ.pop(name, None)
+            else:
+                environ[name] = value
+
+    yield _set_env
+
+    for name, value in reversed(saved):
+        if value is None:
+            os.environ.pop(name, None)
+        else:
+            os.environ[name] = value
+
+
 # =============================================================================
 # DIRECTORY FIXTURES
 # =============================================================================
@@ -219,6 +251,19 @@ def spec_dir(temp_dir: Path) -> Path:
     return spec_path
 
 
+@pytest.fixture(scope="session")
+def shared_spec_dir(tmp_path_factory) -> Path:
+    """Spec directory with a spec.md, built once per session. Treat as read-only."""
+    spec_path = tmp_path_factory.mktemp("specs") / "001-test"
+    spec_path.mkdir(parents=True)
+    fd = os.open(spec_path / "spec.md", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, b"# Spec\n")
+    finally:
+        os.close(fd)
+    return spec_path
+
+
 # =============================================================================
 # REVIEW FIXTURES - Import from review_fixtures.py
 # =============================================================================
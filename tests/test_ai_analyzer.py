@@ -24,3 +24,17 @@ async def test_llm_analysis_client_streams_text(provider_switch, tmp_path):
     assert start_calls
     assert "Analyze the repo" in start_calls[0][1]
     assert "senior software architect" in start_calls[0][1]
+
+
+def test_llm_available_is_not_memoized(monkeypatch):
+    module = importlib.import_module("runners.ai_analyzer.llm_client")
+    available = [True, False]
+
+    class FakeClient:
+        def is_available(self):
+            return available.pop(0)
+
+    monkeypatch.setattr(module, "get_client", FakeClient)
+
+    assert module.LLM_AVAILABLE is True
+    assert module.LLM_AVAILABLE is False
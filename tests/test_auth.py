@@ -3,108 +3,169 @@
 Auth module tests for Codex authentication sources.
 """
 
-import pytest
+import importlib
+import re
 
-import core.auth as auth
+import pytest
 
-from core.auth import (
-    get_auth_token,
-    get_auth_token_source,
-    get_deprecated_auth_token,
-    is_valid_codex_config_dir,
-    is_valid_codex_oauth_token,
-    is_valid_openai_api_key,
-    require_auth_token,
+# The deprecated-token error names the legacy variable, then each replacement.
+_DEPRECATED_OAUTH_MESSAGE = re.compile(
+    r"CLAUDE_CODE_OAUTH_TOKEN.*OPENAI_API_KEY.*CODEX_CODE_OAUTH_TOKEN.*CODEX_CONFIG_DIR",
+    re.DOTALL,
 )
 
 
-def test_get_auth_token_uses_openai_key(monkeypatch):
-    monkeypatch.delenv("CODEX_CODE_OAUTH_TOKEN", raising=False)
-    monkeypatch.delenv("CODEX_CONFIG_DIR", raising=False)
-    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-1234567890abcdef1234")
+@pytest.fixture
+def auth():
+    """core.auth, imported on first use rather than at collection."""
+    return importlib.import_module("core.auth")
+
 
-    assert get_auth_token() == "sk-test-1234567890abcdef1234"
-    assert get_auth_token_source() == "OPENAI_API_KEY"
+def test_get_auth_token_uses_openai_key(auth, set_env):
+    set_env(
+        {
+            "CODEX_CODE_OAUTH_TOKEN": None,
+            "CODEX_CONFIG_DIR": None,
+            "OPENAI_API_KEY": "sk-test-1234567890abcdef1234",
+        }
+    )
 
+    assert auth.get_auth_token() == "sk-test-1234567890abcdef1234"
+    assert auth.get_auth_token_source() == "OPENAI_API_KEY"
 
-def test_get_auth_token_uses_oauth_token(monkeypatch):
-    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
-    monkeypatch.setenv("CODEX_CODE_OAUTH_TOKEN", "codex-token-1234567890abcdef")
 
-    assert get_auth_token() == "codex-token-1234567890abcdef"
-    assert get_auth_token_source() == "CODEX_CODE_OAUTH_TOKEN"
+def test_get_auth_token_uses_oauth_token(auth, set_env):
+    set_env(
+        {
+            "OPENAI_API_KEY": None,
+            "CODEX_CODE_OAUTH_TOKEN": "codex-token-1234567890abcdef",
+        }
+    )
 
+    assert auth.get_auth_token() == "codex-token-1234567890abcdef"
+    assert auth.get_auth_token_source() == "CODEX_CODE_OAUTH_TOKEN"
 
-def test_get_auth_token_uses_config_dir(monkeypatch, tmp_path):
-    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
-    monkeypatch.delenv("CODEX_CODE_OAUTH_TOKEN", raising=False)
-    monkeypatch.setenv("CODEX_CONFIG_DIR", str(tmp_path))
 
-    assert get_auth_token() == str(tmp_path)
-    assert get_auth_token_source() == "CODEX_CONFIG_DIR"
+def test_get_auth_token_uses_config_dir(auth, set_env, tmp_path):
+    set_env(
+        {
+            "OPENAI_API_KEY": None,
+            "CODEX_CODE_OAUTH_TOKEN": None,
+            "CODEX_CONFIG_DIR": str(tmp_path),
+        }
+    )
 
+    assert auth.get_auth_token() == str(tmp_path)
+    assert auth.get_auth_token_source() == "CODEX_CONFIG_DIR"
 
-def test_get_auth_token_uses_default_codex_config_dir(monkeypatch, tmp_path):
+
+def test_get_auth_token_uses_default_codex_config_dir(
+    auth, monkeypatch, set_env, tmp_path
+):
     codex_dir = tmp_path / ".codex"
     codex_dir.mkdir()
     (codex_dir / "config.toml").write_text("")
 
     monkeypatch.setattr(auth, "_DEFAULT_CODEX_CONFIG_DIR", str(codex_dir))
-    monkeypatch.delenv("AUTO_CODEX_DISABLE_DEFAULT_CODEX_CONFIG_DIR", raising=False)
-    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
-    monkeypatch.delenv("CODEX_CODE_OAUTH_TOKEN", raising=False)
-    monkeypatch.delenv("CODEX_CONFIG_DIR", raising=False)
-
-    assert get_auth_token() == str(codex_dir)
-    assert get_auth_token_source() == "DEFAULT_CODEX_CONFIG_DIR"
-
-
-def test_require_auth_token_invalid_format(monkeypatch):
-    monkeypatch.setenv("AUTO_CODEX_DISABLE_DEFAULT_CODEX_CONFIG_DIR", "1")
-    monkeypatch.setenv("OPENAI_API_KEY", "not-a-key")
-    monkeypatch.delenv("CODEX_CODE_OAUTH_TOKEN", raising=False)
-    monkeypatch.delenv("CODEX_CONFIG_DIR", raising=False)
+    set_env(
+        {
+            "AUTO_CODEX_DISABLE_DEFAULT_CODEX_CONFIG_DIR": None,
+            "OPENAI_API_KEY": None,
+            "CODEX_CODE_OAUTH_TOKEN": None,
+            "CODEX_CONFIG_DIR": None,
+        }
+    )
+
+    assert auth.get_auth_token() == str(codex_dir)
+    assert auth.get_auth_token_source() == "DEFAULT_CODEX_CONFIG_DIR"
+
+
+def test_require_auth_token_invalid_format(auth, set_env):
+    set_env(
+        {
+            "AUTO_CODEX_DISABLE_DEFAULT_CODEX_CONFIG_DIR": "1",
+            "OPENAI_API_KEY": "not-a-key",
+            "CODEX_CODE_OAUTH_TOKEN": None,
+            "CODEX_CONFIG_DIR": None,
+        }
+    )
 
     with pytest.raises(ValueError) as excinfo:
-        require_auth_token()
+        auth.require_auth_token()
 
     assert "Invalid OPENAI_API_KEY format" in str(excinfo.value)
 
 
-def test_require_auth_token_deprecated_oauth(monkeypatch):
-    monkeypatch.setenv("AUTO_CODEX_DISABLE_DEFAULT_CODEX_CONFIG_DIR", "1")
-    monkeypatch.delenv("OPENAI_API_KEY", raising=False)
-    monkeypatch.delenv("CODEX_CODE_OAUTH_TOKEN", raising=False)
-    monkeypatch.delenv("CODEX_CONFIG_DIR", raising=False)
-    monkeypatch.setenv("CLAUDE_CODE_OAUTH_TOKEN", "legacy-token")
-
-    assert get_deprecated_auth_token() == "legacy-token"
-    assert get_auth_token() is None
-
-    with pytest.raises(ValueError) as excinfo:
-        require_auth_token()
-
-    message = str(excinfo.value)
-    assert "CLAUDE_CODE_OAUTH_TOKEN" in message
-    assert "OPENAI_API_KEY" in message
-    assert "CODEX_CODE_OAUTH_TOKEN" in message
-    assert "CODEX_CONFIG_DIR" in message
-
-
-def test_is_valid_openai_api_key():
-    assert is_valid_openai_api_key("sk-test-1234567890abcdef1234") is True
-    assert is_valid_openai_api_key("sk-proj-1234567890abcdef1234") is True
-    assert is_valid_openai_api_key("thirdparty-12345678901234567890") is True
-    assert is_valid_openai_api_key("sk_123") is False
-    assert is_valid_openai_api_key("not-a-key") is False
-
-
-def test_is_valid_codex_oauth_token():
-    assert is_valid_codex_oauth_token("codex-token-1234567890abcdef") is True
-    assert is_valid_codex_oauth_token("short-token") is False
-    assert is_valid_codex_oauth_token("token with space") is False
-
-
-def test_is_valid_codex_config_dir(tmp_path):
-    assert is_valid_codex_config_dir(str(tmp_path)) is True
-    assert is_valid_codex_config_dir(str(tmp_path / "missing")) is False
+def test_require_auth_token_deprecated_oauth(auth, set_env):
+    set_env(
+        {
+            "AUTO_CODEX_DISABLE_DEFAULT_CODEX_CONFIG_DIR": "1",
+            "OPENAI_API_KEY": None,
+            "CODEX_CODE_OAUTH_TOKEN": None,
+            "CODEX_CONFIG_DIR": None,
+            "CLAUDE_CODE_OAUTH_TOKEN": "legacy-token",
+        }
+    )
+
+    assert auth.get_deprecated_auth_token() == "legacy-token"
+    assert auth.get_auth_token() is None
+
+    with pytest.raises(ValueError, match=_DEPRECATED_OAUTH_MESSAGE):
+        auth.require_auth_token()
+
+
+def test_is_valid_openai_api_key(auth):
+    assert auth.is_valid_openai_api_key("sk-test-1234567890abcdef1234") is True
+    assert auth.is_valid_openai_api_key("sk-proj-1234567890abcdef1234") is True
+    assert auth.is_valid_openai_api_key("thirdparty-12345678901234567890") is True
+    assert auth.is_valid_openai_api_key("sk_123") is False
+    assert auth.is_valid_openai_api_key("not-a-key") is False
+
+
+def test_is_valid_codex_oauth_token(auth):
+    assert auth.is_valid_codex_oauth_token("codex-token-1234567890abcdef") is True
+    assert auth.is_valid_codex_oauth_token("short-token") is False
+    assert auth.is_valid_codex_oauth_token("token with space") is False
+
+
+def test_is_valid_codex_config_dir(auth, tmp_path):
+    assert auth.is_valid_codex_config_dir(str(tmp_path)) is True
+    assert auth.is_valid_codex_config_dir(str(tmp_path / "missing")) is False
+
+
+def test_get_auth_token_with_source_matches_individual_getters(auth, set_env):
+    set_env(
+        {
+            "OPENAI_API_KEY": None,
+            "CODEX_CONFIG_DIR": None,
+            "CODEX_CODE_OAUTH_TOKEN": "codex-token-1234567890abcdef",
+        }
+    )
+
+    assert auth.get_auth_token_with_source() == (
+        auth.get_auth_token(),
+        auth.get_auth_token_source(),
+    )
+    assert auth.get_auth_token_with_source() == (
+        "codex-token-1234567890abcdef",
+        "CODEX_CODE_OAUTH_TOKEN",
+    )
+
+
+def test_config_dir_created_after_first_check_is_picked_up(auth, set_env, tmp_path):
+    config_dir = tmp_path / "codex"
+    set_env(
+        {
+            "AUTO_CODEX_DISABLE_DEFAULT_CODEX_CONFIG_DIR": "1",
+            "OPENAI_API_KEY": None,
+            "CODEX_CODE_OAUTH_TOKEN": None,
+            "CODEX_CONFIG_DIR": str(config_dir),
+        }
+    )
+    assert auth.get_auth_token() is None
+    with pytest.raises(ValueError, match="Directory does not exist"):
+        auth.require_auth_token()
+
+    config_dir.mkdir()
+    assert auth.get_auth_token() == str(config_dir)
+    assert auth.require_auth_token() == str(config_dir)
@@ -1,8 +1,14 @@
+import asyncio
+import os
 import sys
+import threading
 
+import core.client as core_client
+import providers.codex_cli as codex_cli
 import pytest
-
+from core.client import clear_client_cache, create_client, get_client
 from core.protocols import EventType
+from project_analyzer import SecurityProfile
 from providers.codex_cli import CodexCliClient
 
 
@@ -26,6 +32,48 @@ async def test_start_and_close_session(monkeypatch: pytest.MonkeyPatch) -> None:
     await client.close(session_id)
     assert session_id not in client._sessions
 
+    # Closing again (e.g. adapter after stream_events already closed) is a no-op.
+    await client.close(session_id)
+    await client.close("unknown-session")
+
+
+@pytest.mark.asyncio
+async def test_session_ids_are_unique_across_clients(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    clients = [CodexCliClient(timeout=1), CodexCliClient(timeout=1)]
+    for client in clients:
+        monkeypatch.setattr(
+            client, "_build_command", lambda prompt, **kwargs: _python_cmd("pass")
+        )
+
+    session_ids = [
+        await client.start_session("hello") for client in clients for _ in range(2)
+    ]
+    assert len(set(session_ids)) == len(session_ids)
+
+    for client in clients:
+        for session_id in list(client._sessions):
+            await client.close(session_id)
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+def test_session_id_prefix_follows_fork() -> None:
+    assert codex_cli._SESSION_PREFIX == f"{os.getpid()}-"
+
+    read_fd, write_fd = os.pipe()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_fd)
+        os.write(write_fd, codex_cli._SESSION_PREFIX.encode())
+        os._exit(0)
+    os.close(write_fd)
+    with os.fdopen(read_fd, "rb") as pipe:
+        child_prefix = pipe.read().decode()
+    os.waitpid(pid, 0)
+
+    assert child_prefix == f"{pid}-"
+
 
 @pytest.mark.asyncio
 async def test_stream_events_parses_output(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -55,6 +103,8 @@ async def test_stream_events_parses_output(monkeypatch: pytest.MonkeyPatch) -> N
 
     text_events = [event for event in events if event.type == EventType.TEXT]
     assert any(event.data.get("content") == "hello" for event in text_events)
+    assert any(event.data.get("content") == "not-json" for event in text_events)
+    assert all(isinstance(event.data.get("content"), str) for event in text_events)
 
 
 def test_parse_output_line_variants() -> None:
@@ -77,6 +127,89 @@ def test_parse_output_line_variants() -> None:
     assert non_json.type == EventType.TEXT
     assert non_json.data["content"] == "not json"
 
+    assert client._parse_output_line('{"type":"turn.started"}') is None
+
+    unknown = client._parse_output_line('{"type":"something.new"}')
+    assert unknown.type == EventType.TEXT
+    assert unknown.data["raw"] == '{"type":"something.new"}'
+
+    not_object = client._parse_output_line("[1, 2]")
+    assert not_object.data["raw"] == "[1, 2]"
+
+
+def test_parse_output_line_accepts_bytes() -> None:
+    client = CodexCliClient()
+
+    message = client._parse_output_line(b'{"type":"message","content":"hi"}')
+    assert message.type == EventType.TEXT
+    assert message.data["content"] == "hi"
+
+    non_json = client._parse_output_line(b"not json \xff")
+    assert non_json.type == EventType.TEXT
+    assert non_json.data["content"] == "not json \ufffd"
+
+
+def test_parse_output_line_keeps_stdlib_json_extensions() -> None:
+    client = CodexCliClient()
+
+    big = client._parse_output_line(b'{"type":"tool_result","n":18446744073709551616}')
+    assert big.type == EventType.TOOL_RESULT
+
+    nan = client._parse_output_line(b'{"type":"tool_result","score":NaN}')
+    assert nan.type == EventType.TOOL_RESULT
+
+
+@pytest.mark.asyncio
+async def test_stream_events_handles_split_and_unterminated_lines(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = CodexCliClient(timeout=2)
+
+    def fake_build_command(prompt: str, **kwargs) -> list[str]:
+        script = (
+            "import sys, time; "
+            'sys.stdout.write(\'{"type": "message", \'); sys.stdout.flush(); '
+            "time.sleep(0.1); "
+            'sys.stdout.write(\'"content": "one"}\\n\'); '
+            'sys.stdout.write(\'{"type": "message", "content": "two"}\'); '
+            "sys.stdout.flush()"
+        )
+        return _python_cmd(script)
+
+    monkeypatch.setattr(client, "_build_command", fake_build_command)
+
+    session_id = await client.start_session("hello")
+    events = [event async for event in client.stream_events(session_id)]
+
+    contents = [
+        event.data["content"] for event in events if event.type == EventType.TEXT
+    ]
+    assert contents == ["one", "two"]
+
+
+@pytest.mark.asyncio
+async def test_stream_event_batches_groups_lines_from_one_read(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = CodexCliClient(timeout=2)
+
+    def fake_build_command(prompt: str, **kwargs) -> list[str]:
+        script = (
+            "import sys; "
+            'sys.stdout.write(\'\'.join(\'{"type": "message", "content": "%d"}\\n\' % i for i in range(3))); '
+            "sys.stdout.flush()"
+        )
+        return _python_cmd(script)
+
+    monkeypatch.setattr(client, "_build_command", fake_build_command)
+
+    session_id = await client.start_session("hello")
+    batches = [batch async for batch in client.stream_event_batches(session_id)]
+
+    assert [event.type for event in batches[0]] == [EventType.SESSION_START]
+    assert [event.data["content"] for event in batches[1]] == ["0", "1", "2"]
+    assert [event.type for event in batches[-1]] == [EventType.SESSION_END]
+
 
 def test_model_suffix_maps_to_reasoning_effort() -> None:
     client = CodexCliClient(model="gpt-5.2-codex-xhigh")
@@ -106,6 +239,32 @@ async def test_process_crash_emits_error(monkeypatch: pytest.MonkeyPatch) -> Non
     errors = [event for event in events if event.type == EventType.ERROR]
     assert errors
     assert any(event.data.get("returncode") == 2 for event in errors)
+    assert any(event.data.get("stderr") == "boom" for event in errors)
+
+
+@pytest.mark.asyncio
+async def test_verbose_stderr_does_not_stall_process(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = CodexCliClient(timeout=5)
+
+    def fake_build_command(prompt: str, **kwargs) -> list[str]:
+        # Far more than a pipe buffer, written before any stdout.
+        script = "import sys; sys.stderr.write('x' * 1_000_000); sys.stderr.flush(); print('done'); sys.exit(1)"
+        return _python_cmd(script)
+
+    monkeypatch.setattr(client, "_build_command", fake_build_command)
+
+    session_id = await client.start_session("hello")
+    events = [event async for event in client.stream_events(session_id)]
+
+    assert any(
+        event.type == EventType.TEXT and event.data.get("content") == "done"
+        for event in events
+    )
+    errors = [event for event in events if event.data.get("returncode") == 1]
+    assert errors
+    assert len(errors[0].data["stderr"]) == 65536
 
 
 @pytest.mark.asyncio
@@ -125,16 +284,314 @@ async def test_timeout_emits_error(monkeypatch: pytest.MonkeyPatch) -> None:
     assert any("timeout" in event.data.get("error", "") for event in errors)
 
 
-def test_is_available_checks_env(monkeypatch: pytest.MonkeyPatch) -> None:
+@pytest.mark.asyncio
+async def test_timeout_ignores_time_spent_by_consumer(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = CodexCliClient(timeout=0.5)
+
+    def fake_build_command(prompt: str, **kwargs) -> list[str]:
+        script = (
+            "import json, time; "
+            "print(json.dumps({'type': 'message', 'content': 'one'}), flush=True); "
+            "time.sleep(0.2); "
+            "print(json.dumps({'type': 'message', 'content': 'two'}), flush=True)"
+        )
+        return _python_cmd(script)
+
+    monkeypatch.setattr(client, "_build_command", fake_build_command)
+
+    session_id = await client.start_session("hello")
+    events = []
+    async for event in client.stream_events(session_id):
+        events.append(event)
+        if event.type == EventType.TEXT:
+            await asyncio.sleep(0.7)
+
+    assert not [event for event in events if event.type == EventType.ERROR]
+    assert [
+        event.data["content"] for event in events if event.type == EventType.TEXT
+    ] == [
+        "one",
+        "two",
+    ]
+
+
+@pytest.fixture
+def availability_cache():
+    """Start and finish with empty is_available() caches."""
+    CodexCliClient.invalidate_availability()
+    yield
+    CodexCliClient.invalidate_availability()
+
+
+def test_is_available_checks_env(
+    availability_cache, monkeypatch: pytest.MonkeyPatch
+) -> None:
     client = CodexCliClient()
 
     monkeypatch.setattr("shutil.which", lambda name: "/usr/bin/codex")
-    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-1234567890abcdef1234")
     assert client.is_available() is True
 
     monkeypatch.setattr("shutil.which", lambda name: None)
+    monkeypatch.setattr("providers.codex_cli.CODEX_SEARCH_PATHS", [])
+    assert client.is_available() is True  # cached until invalidated
+    CodexCliClient.invalidate_availability()
     assert client.is_available() is False
 
     monkeypatch.setattr("shutil.which", lambda name: "/usr/bin/codex")
+    monkeypatch.setenv("AUTO_CODEX_DISABLE_DEFAULT_CODEX_CONFIG_DIR", "1")
     monkeypatch.delenv("OPENAI_API_KEY", raising=False)
+    monkeypatch.delenv("CODEX_CODE_OAUTH_TOKEN", raising=False)
+    monkeypatch.delenv("CODEX_CONFIG_DIR", raising=False)
+    CodexCliClient.invalidate_availability()
     assert client.is_available() is False
+
+
+@pytest.fixture
+def client_cache():
+    """Start and finish with an empty get_client() cache."""
+    clear_client_cache()
+    yield
+    clear_client_cache()
+
+
+def test_get_client_reuses_instance_per_config(client_cache, tmp_path) -> None:
+    first = get_client(project_dir=tmp_path, model="gpt-5.2-codex")
+    second = get_client(project_dir=tmp_path, model="gpt-5.2-codex")
+    other = get_client(project_dir=tmp_path, model="gpt-4o")
+
+    assert first is second
+    assert other is not first
+    assert first.workdir == str(tmp_path.resolve())
+
+
+def test_get_client_resolves_relative_dir_against_cwd(
+    client_cache, monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    second.mkdir()
+
+    monkeypatch.chdir(first)
+    assert get_client(project_dir=".").workdir == str(first.resolve())
+    monkeypatch.chdir(second)
+    assert get_client(project_dir=".").workdir == str(second.resolve())
+
+
+def test_get_client_follows_env_defaults(
+    client_cache, monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    monkeypatch.setenv("AUTO_BUILD_MODEL", "gpt-5.2-codex")
+    monkeypatch.delenv("AUTO_CODEX_CODEXCLI_WORKER_POOL", raising=False)
+    default = get_client(project_dir=tmp_path)
+
+    monkeypatch.setenv("AUTO_BUILD_MODEL", "gpt-4o")
+    switched_model = get_client(project_dir=tmp_path)
+    assert switched_model is not default
+    assert switched_model.model == "gpt-4o"
+
+    monkeypatch.setenv("AUTO_CODEX_CODEXCLI_WORKER_POOL", "1")
+    pooled = get_client(project_dir=tmp_path)
+    assert pooled is not switched_model
+    assert pooled.worker_pool is True
+
+
+def test_get_client_cache_is_bounded(
+    client_cache, monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    monkeypatch.setattr(core_client, "_CLIENT_CACHE_SIZE", 2)
+    first = get_client(project_dir=tmp_path, timeout=1)
+    get_client(project_dir=tmp_path, timeout=2)
+    get_client(project_dir=tmp_path, timeout=3)
+
+    assert len(core_client._CLIENT_CACHE) == 2
+    assert get_client(project_dir=tmp_path, timeout=1) is not first
+
+
+_REPL_WORKER_SCRIPT = (
+    "import json, os, sys\n"
+    "for raw in sys.stdin:\n"
+    "    req = json.loads(raw)\n"
+    "    msg = {'type': 'message', 'content': f\"{os.getpid()}:{req['prompt']}\"}\n"
+    "    print(json.dumps(msg))\n"
+    "    print(json.dumps({'type': 'end', 'id': req['id']}), flush=True)\n"
+)
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_reuses_worker_process(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("providers.codex_cli.WORKER_POOL_SIZE", 1)
+    client = CodexCliClient(timeout=5, worker_pool=True)
+    monkeypatch.setattr(
+        client, "_build_worker_command", lambda: _python_cmd(_REPL_WORKER_SCRIPT)
+    )
+
+    contents = []
+    try:
+        for prompt in ("first", "second"):
+            session_id = await client.start_session(prompt)
+            events = [event async for event in client.stream_events(session_id)]
+            assert events[-1].type == EventType.SESSION_END
+            assert not [event for event in events if event.type == EventType.ERROR]
+            contents.extend(
+                event.data["content"]
+                for event in events
+                if event.type == EventType.TEXT
+            )
+            assert session_id not in client._sessions
+    finally:
+        await client.shutdown_workers()
+
+    pids = {content.split(":")[0] for content in contents}
+    assert [content.split(":")[1] for content in contents] == ["first", "second"]
+    assert len(pids) == 1
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_discards_worker_closed_mid_response(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = CodexCliClient(timeout=5, worker_pool=True)
+    monkeypatch.setattr(
+        client, "_build_worker_command", lambda: _python_cmd(_REPL_WORKER_SCRIPT)
+    )
+
+    session_id = await client.start_session("abandoned")
+    process = client._sessions[session_id].process
+    await client.close(session_id)
+
+    assert await process.wait() != 0
+    assert process not in client._pool.workers()
+    await client.shutdown_workers()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_rejects_send_to_pooled_session(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("providers.codex_cli.WORKER_POOL_SIZE", 1)
+    client = CodexCliClient(timeout=5, worker_pool=True)
+    monkeypatch.setattr(
+        client, "_build_worker_command", lambda: _python_cmd(_REPL_WORKER_SCRIPT)
+    )
+
+    try:
+        session_id = await client.start_session("first")
+        with pytest.raises(RuntimeError, match="pooled"):
+            await client.send(session_id, "not a request")
+        events = [event async for event in client.stream_events(session_id)]
+        assert not [event for event in events if event.type == EventType.ERROR]
+
+        session_id = await client.start_session("second")
+        events = [event async for event in client.stream_events(session_id)]
+        assert [
+            event.data["content"] for event in events if event.type == EventType.TEXT
+        ][-1].endswith(":second")
+    finally:
+        await client.shutdown_workers()
+
+
+@pytest.mark.asyncio
+async def test_worker_pool_wakes_waiter_when_worker_is_discarded(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setattr("providers.codex_cli.WORKER_POOL_SIZE", 1)
+    client = CodexCliClient(timeout=5, worker_pool=True)
+    slow_worker = _REPL_WORKER_SCRIPT.replace(
+        "    req = ", "    import time; time.sleep(0.3)\n    req = "
+    )
+    monkeypatch.setattr(
+        client, "_build_worker_command", lambda: _python_cmd(slow_worker)
+    )
+
+    async def second() -> list:
+        session_id = await client.start_session("second")
+        return [event async for event in client.stream_events(session_id)]
+
+    try:
+        first = await client.start_session("first")
+        waiter = asyncio.create_task(second())
+        await asyncio.sleep(0.05)
+        # Abandon the only worker mid-response; the waiter must get a new one.
+        await client.close(first)
+        events = await asyncio.wait_for(waiter, 5)
+    finally:
+        await client.shutdown_workers()
+
+    contents = [
+        event.data["content"] for event in events if event.type == EventType.TEXT
+    ]
+    assert [content.split(":")[1] for content in contents] == ["second"]
+
+
+def test_worker_pool_keeps_separate_workers_per_event_loop(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    client = CodexCliClient(timeout=5, worker_pool=True)
+    monkeypatch.setattr(
+        client, "_build_worker_command", lambda: _python_cmd(_REPL_WORKER_SCRIPT)
+    )
+
+    async def run(prompt: str):
+        session_id = await client.start_session(prompt)
+        [event async for event in client.stream_events(session_id)]
+        return client._pool.workers()[0]
+
+    # A long-lived loop on another thread, like the merge resolver's.
+    background = asyncio.new_event_loop()
+    thread = threading.Thread(target=background.run_forever, daemon=True)
+    thread.start()
+    try:
+        background_worker = asyncio.run_coroutine_threadsafe(
+            run("first"), background
+        ).result(5)
+
+        # asyncio.run() gets its own worker, leaves the other loop's alone, and
+        # stops its worker when the loop shuts down.
+        run_worker = asyncio.run(run("second"))
+        assert run_worker is not background_worker
+        assert run_worker.returncode is not None
+        assert background_worker.returncode is None
+    finally:
+        asyncio.run_coroutine_threadsafe(client.shutdown_workers(), background).result(
+            5
+        )
+        background.call_soon_threadsafe(background.stop)
+        thread.join(5)
+        background.close()
+
+    assert background_worker.returncode is not None
+
+
+def test_worker_pool_is_opt_in(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("AUTO_CODEX_CODEXCLI_WORKER_POOL", raising=False)
+    assert CodexCliClient().worker_pool is False
+
+    monkeypatch.setenv("AUTO_CODEX_CODEXCLI_WORKER_POOL", "1")
+    assert CodexCliClient().worker_pool is True
+    assert CodexCliClient()._build_worker_command()[1] == "repl"
+
+
+def test_create_client_rebuilds_security_args_per_call(
+    monkeypatch: pytest.MonkeyPatch, tmp_path
+) -> None:
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test-1234567890abcdef1234")
+    monkeypatch.setenv("AUTO_CODEX_CODEXCLI_LEGACY_SECURITY_FLAGS", "1")
+    profiles = iter(
+        [SecurityProfile(base_commands={"ls"}), SecurityProfile(base_commands={"make"})]
+    )
+    monkeypatch.setattr(
+        core_client,
+        "get_security_profile",
+        lambda project_dir, spec_dir: next(profiles),
+    )
+
+    first = create_client(tmp_path, tmp_path)
+    second = create_client(tmp_path, tmp_path)
+
+    assert "--allowed-command=ls" in first._client.extra_args
+    assert "--allowed-command=make" in second._client.extra_args
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Tests for .auto-codex directory initialization and gitignore handling.
+"""
+
+import importlib
+import shutil
+from pathlib import Path
+
+import pytest
+
+
+@pytest.fixture
+def init(monkeypatch):
+    """Real init module (other test modules install a mock under this name)."""
+    module = importlib.import_module("init")
+    monkeypatch.setattr(module, "_CHECKED_DIRS", set())
+    return module
+
+
+def test_ensure_gitignore_entry_creates_file(init, tmp_path):
+    assert init.ensure_gitignore_entry(tmp_path) is True
+    assert (
+        tmp_path / ".gitignore"
+    ).read_text() == "# Auto Codex data directory\n.auto-codex/\n"
+
+
+@pytest.mark.parametrize(
+    "existing", [".auto-codex", ".auto-codex/", "  .auto-codex/  "]
+)
+def test_ensure_gitignore_entry_detects_existing_variants(init, tmp_path, existing):
+    gitignore = tmp_path / ".gitignore"
+    gitignore.write_text(f"node_modules/\n{existing}\n")
+
+    assert init.ensure_gitignore_entry(tmp_path) is False
+    assert gitignore.read_text() == f"node_modules/\n{existing}\n"
+
+
+def test_ensure_gitignore_entry_appends_and_preserves_content(init, tmp_path):
+    gitignore = tmp_path / ".gitignore"
+    gitignore.write_bytes(b"build/\n# caf\xe9")
+
+    assert init.ensure_gitignore_entry(tmp_path) is True
+    assert gitignore.read_bytes() == (
+        b"build/\n# caf\xe9\n\n# Auto Codex data directory\n.auto-codex/\n"
+    )
+
+
+def test_init_auto_codex_dir_checks_gitignore_once_per_process(
+    init, tmp_path, monkeypatch
+):
+    auto_codex_dir = tmp_path / ".auto-codex"
+    auto_codex_dir.mkdir()
+
+    calls = []
+    monkeypatch.setattr(
+        init,
+        "ensure_gitignore_entry",
+        lambda project_dir, entry: calls.append(entry) or True,
+    )
+
+    assert init.init_auto_codex_dir(tmp_path) == (auto_codex_dir, True)
+    assert (auto_codex_dir / ".gitignore_checked").exists()
+
+    (auto_codex_dir / ".gitignore_checked").unlink()
+    assert init.init_auto_codex_dir(tmp_path) == (auto_codex_dir, False)
+    assert calls == [".auto-codex/"]
+
+
+def test_init_auto_codex_dir_recreates_deleted_dir(init, tmp_path):
+    auto_codex_dir, _ = init.init_auto_codex_dir(tmp_path)
+    shutil.rmtree(auto_codex_dir)
+
+    assert init.get_auto_codex_dir(tmp_path) == auto_codex_dir
+    assert auto_codex_dir.is_dir()
+
+
+def test_init_auto_codex_dir_keys_relative_paths_on_cwd(init, tmp_path, monkeypatch):
+    first, second = tmp_path / "first", tmp_path / "second"
+    first.mkdir()
+    (second / ".auto-codex").mkdir(parents=True)
+
+    monkeypatch.chdir(first)
+    init.init_auto_codex_dir(Path("."))
+    monkeypatch.chdir(second)
+    _, gitignore_updated = init.init_auto_codex_dir(Path("."))
+
+    assert gitignore_updated is True
+    assert (second / ".auto-codex" / ".gitignore_checked").exists()
@@ -1,3 +1,4 @@
+import sys
 from datetime import datetime
 
 from core.protocols import EventType, LLMEvent
@@ -52,3 +53,32 @@ def test_llm_resolver_uses_provider(provider_switch):
         for call in mock_client.calls
         if call[0] == "start_session"
     )
+
+
+def test_llm_resolver_reuses_client_and_loop(provider_switch, monkeypatch):
+    from merge.ai_resolver import llm_client
+
+    mock_client = provider_switch(
+        client=MockCodexClient(
+            responses=[LLMEvent(type=EventType.TEXT, data={"content": "merged"})]
+        )
+    )
+    lookups = []
+    client_module = sys.modules["core.client"]
+    original_get_client = client_module.get_client
+
+    def _counting_get_client(*args, **kwargs):
+        lookups.append(args)
+        return original_get_client(*args, **kwargs)
+
+    monkeypatch.setattr(client_module, "get_client", _counting_get_client)
+    resolver = create_llm_resolver()
+
+    assert resolver.ai_call_fn("system", "first") == "merged"
+    loop = llm_client._LoopRunner.get().loop
+    assert resolver.ai_call_fn("system", "second") == "merged"
+
+    assert llm_client._LoopRunner.get().loop is loop
+    assert len(lookups) == 1
+    starts = [call for call in mock_client.calls if call[0] == "start_session"]
+    assert len(starts) == 2
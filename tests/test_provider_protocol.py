@@ -1,6 +1,8 @@
+from unittest.mock import MagicMock
+
 import pytest
 
-from core.protocols import EventType, LLMClientProtocol, LLMEvent
+from core.protocols import EventType, LLMClientProtocol, LLMEvent, iter_event_batches
 from tests.fixtures.codex_mocks import MockCodexClient
 
 
@@ -59,3 +61,25 @@ async def test_mock_codex_client_streams_events() -> None:
 
     assert [event.type for event in streamed] == [EventType.TEXT, EventType.TOOL_START]
     await client.close(session_id)
+
+
+@pytest.mark.asyncio
+async def test_iter_event_batches_falls_back_to_stream_events() -> None:
+    events = [
+        LLMEvent(type=EventType.TEXT, data={"content": "hello"}),
+        LLMEvent(type=EventType.TEXT, data={"content": "world"}),
+    ]
+
+    async def stream_events(session_id: str):
+        for event in events:
+            yield event
+
+    # Protocol subclasses get the default one-event batches; a MagicMock's
+    # fabricated stream_event_batches must not swallow the real stream.
+    subclass_client = MockCodexClient(responses=events)
+    mock_client = MagicMock()
+    mock_client.stream_events = stream_events
+
+    for client in (subclass_client, mock_client):
+        batches = [batch async for batch in iter_event_batches(client, "session")]
+        assert [list(batch) for batch in batches] == [[event] for event in events]